@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Offline analyzer for large benchmark result files.
+
+Reads the per-request CSV written by StaticBenchmark.py (--csv), WebsocketBenchmark.py (--out-csv) or
+PubSubBenchmark.py (--out-csv) and produces a self-contained HTML report (inline SVG, no external assets).
+
+- The first time a CSV is analyzed it is converted, in chunks, into a compact columnar cache next to it
+  (<file>.cols/: one .npy per column plus meta.json). Later runs memory-map those columns directly, so
+  tens of millions of rows load in well under a second.
+- All aggregation is vectorised with NumPy: overall percentiles, per-second time series, per-worker and
+  per-status breakdowns, and a latency-over-time heatmap.
+
+Install dependencies:
+    pip install numpy
+
+Example usage:
+    python AnalyzeResults.py out.csv -o report.html
+    python AnalyzeResults.py static.csv ws.csv pubsub.csv -o report.html --json summary.json
+"""
+import argparse
+import csv
+import html
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+COLUMNS = {"t": np.float64, "latency_ms": np.float64, "worker": np.int32, "status": np.int16, "cache": np.int8}
+CACHE_STATES = ["cold", "warm"]
+# bump when the cache layout changes so older .cols directories are rebuilt
+CACHE_VERSION = 2
+QUANTILES = [50, 90, 95, 99]
+CHUNK_ROWS = 1_000_000
+# Raw CSV columns each result format needs, and ones used when present (older files lack them)
+SOURCE_COLUMNS = {
+    "static": ["ts", "latency_ms", "status_code"],
+    "websocket": ["worker", "rtt_s", "error"],
+    "pubsub": ["worker", "send_start_s", "send_duration_s", "success"],
+}
+OPTIONAL_COLUMNS = {"static": ["worker", "cache", "error"], "websocket": [], "pubsub": []}
+
+
+# ---- Columnar cache ----
+
+
+def detect_kind(header: List[str]) -> str:
+    if "latency_ms" in header:
+        return "static"
+    if "rtt_s" in header:
+        return "websocket"
+    if "send_duration_s" in header:
+        return "pubsub"
+    raise ValueError(f"Unrecognised result file header: {header}")
+
+
+def _count_rows(path: str) -> int:
+    """Number of lines, including a final line without a trailing newline (e.g. from a killed run)."""
+    rows = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(1 << 24)
+            if not block:
+                break
+            rows += block.count(b"\n")
+            last = block[-1:]
+    return rows + (last != b"\n")
+
+
+def _line_chunks(f, size: int) -> Iterator[List[str]]:
+    """Yield lists of ~size lines, never splitting a quoted field that spans lines."""
+    while True:
+        chunk = list(itertools.islice(f, size))
+        if not chunk:
+            return
+        quotes = "".join(chunk).count('"')
+        while quotes % 2:
+            line = next(f, None)
+            if line is None:
+                break
+            chunk.append(line)
+            quotes += line.count('"')
+        yield chunk
+
+
+def _floats(values: np.ndarray) -> np.ndarray:
+    arr = values.copy()
+    arr[arr == b""] = b"nan"
+    return arr.astype(np.float64)
+
+
+def _normalise_chunk(kind: str, cols: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Map one chunk of raw CSV columns onto the common t / latency_ms / worker / status(label) columns."""
+    n = len(next(iter(cols.values())))
+    no_cache = np.full(n, -1, dtype=np.int8)
+    if kind == "static":
+        codes = cols["status_code"]
+        labels = np.where(codes == b"", b"error", codes)
+        if "error" in cols:
+            # e.g. a page load whose HTML was 200 but a sub-resource failed
+            labels = np.where(cols["error"] != b"", b"error", labels)
+        worker = np.full(n, -1, dtype=np.int32)
+        if "worker" in cols:
+            worker = np.nan_to_num(_floats(cols["worker"]), nan=-1).astype(np.int32)
+        cache = no_cache
+        if "cache" in cols:
+            cache = np.select([cols["cache"] == state.encode() for state in CACHE_STATES],
+                              list(range(len(CACHE_STATES))), default=-1).astype(np.int8)
+        return {"t": _floats(cols["ts"]), "latency_ms": _floats(cols["latency_ms"]),
+                "worker": worker, "cache": cache, "labels": labels}
+    if kind == "websocket":
+        errors = cols["error"]
+        labels = np.where(errors == b"", b"ok", np.char.partition(errors, b":")[:, 0])
+        return {"t": np.full(n, np.nan), "latency_ms": _floats(cols["rtt_s"]) * 1000.0,
+                "worker": _floats(cols["worker"]).astype(np.int32), "cache": no_cache, "labels": labels}
+    success = cols["success"]
+    return {"t": _floats(cols["send_start_s"]), "latency_ms": _floats(cols["send_duration_s"]) * 1000.0,
+            "worker": _floats(cols["worker"]).astype(np.int32), "cache": no_cache,
+            "labels": np.where(success == b"True", b"ok", b"error")}
+
+
+def convert_csv(path: str, cache_dir: str) -> str:
+    """
+    Convert a result CSV into the columnar cache directory; returns cache_dir.
+    Parsing uses NumPy's C CSV reader (loadtxt) over line chunks, so memory stays bounded by CHUNK_ROWS.
+    """
+    n_rows = max(0, _count_rows(path) - 1)
+    os.makedirs(cache_dir, exist_ok=True)
+    out = {name: np.lib.format.open_memmap(os.path.join(cache_dir, f"{name}.npy"), mode="w+", dtype=dtype,
+                                           shape=(n_rows,))
+           for name, dtype in COLUMNS.items()}
+    labels: Dict[str, int] = {}
+
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        header = next(csv.reader([f.readline()]), [])
+        kind = detect_kind(header)
+        names = SOURCE_COLUMNS[kind] + [name for name in OPTIONAL_COLUMNS[kind] if name in header]
+        usecols = [header.index(name) for name in names]
+        pos = 0
+        for lines in _line_chunks(f, CHUNK_ROWS):
+            # fixed-width bytes parse and convert several times faster than unicode strings
+            raw = np.loadtxt(lines, delimiter=",", quotechar='"', usecols=usecols, dtype="S32", ndmin=2,
+                             encoding=None)
+            if not raw.size:
+                continue
+            cols = {name: raw[:, i] for i, name in enumerate(names)}
+            norm = _normalise_chunk(kind, cols)
+            uniq, inverse = np.unique(norm.pop("labels"), return_inverse=True)
+            mapping = np.array([labels.setdefault(u.decode("utf-8", "replace"), len(labels)) for u in uniq], dtype=np.int16)
+            norm["status"] = mapping[inverse]
+            end = pos + raw.shape[0]
+            for name in COLUMNS:
+                out[name][pos:end] = norm[name]
+            pos = end
+
+    for arr in out.values():
+        arr.flush()
+    del out
+    if pos != n_rows:
+        # quoted fields with embedded newlines make the line count an overestimate; trim the unused tail
+        for name in COLUMNS:
+            p = os.path.join(cache_dir, f"{name}.npy")
+            np.save(p, np.load(p, mmap_mode="r")[:pos].copy())
+
+    with open(os.path.join(cache_dir, "meta.json"), "w") as f:
+        json.dump({"version": CACHE_VERSION, "source": os.path.abspath(path), "kind": kind, "rows": pos,
+                   "labels": sorted(labels, key=labels.get)}, f, indent=2)
+    return cache_dir
+
+
+def load_columns(path: str, use_cache: bool = True) -> Dict:
+    """Return memory-mapped columns for a result CSV (converting it if needed) or an existing .cols directory."""
+    if os.path.isdir(path):
+        cache_dir = path
+    else:
+        cache_dir = path + ".cols"
+        meta_path = os.path.join(cache_dir, "meta.json")
+        stale = not os.path.exists(meta_path) or os.path.getmtime(meta_path) < os.path.getmtime(path)
+        if not stale:
+            with open(meta_path) as f:
+                stale = json.load(f).get("version") != CACHE_VERSION
+        if stale or not use_cache:
+            t0 = time.perf_counter()
+            convert_csv(path, cache_dir)
+            print(f"Converted {path} -> {cache_dir} in {time.perf_counter() - t0:.2f}s")
+    with open(os.path.join(cache_dir, "meta.json")) as f:
+        meta = json.load(f)
+    data = {name: np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r") for name in COLUMNS}
+    data["meta"] = meta
+    return data
+
+
+# ---- Vectorised aggregation ----
+
+
+def group_stats(keys: np.ndarray, values: np.ndarray, n_groups: int) -> Dict[str, np.ndarray]:
+    """
+    Per-group count, mean and percentiles (linear interpolation, as in ResourceMonitor.percentile)
+    for non-negative integer keys, computed with one lexsort instead of a Python loop over groups.
+    """
+    order = np.lexsort((values, keys))
+    v = values[order]
+    counts = np.bincount(keys, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    sums = np.bincount(keys, weights=values, minlength=n_groups)
+    out = {"count": counts, "mean": np.divide(sums, counts, out=np.zeros(n_groups), where=counts > 0)}
+    has = counts > 0
+    for q in QUANTILES:
+        k = (counts - 1).clip(min=0) * (q / 100.0)
+        lo = np.floor(k).astype(np.int64)
+        hi = np.minimum(lo + 1, (counts - 1).clip(min=0))
+        res = np.zeros(n_groups)
+        if v.size:
+            lo_v = v[np.where(has, starts + lo, 0)]
+            hi_v = v[np.where(has, starts + hi, 0)]
+            res = np.where(has, lo_v + (hi_v - lo_v) * (k - lo), 0.0)
+        out[f"p{q}"] = res
+    return out
+
+
+def _breakdown(keys: np.ndarray, lat: np.ndarray, mask: np.ndarray, key_name: str, names=None) -> List[Dict]:
+    """Rows of count / mean / percentiles for each non-negative key selected by mask."""
+    if not mask.any():
+        return []
+    k = keys[mask].astype(np.int64)
+    stats = group_stats(k, lat[mask], int(k.max()) + 1)
+    return [
+        {key_name: names[i] if names else int(i), "count": int(stats["count"][i]),
+         **{m: float(stats[m][i]) for m in ["mean"] + [f"p{q}" for q in QUANTILES]}}
+        for i in np.nonzero(stats["count"])[0]
+    ]
+
+
+def analyze(data: Dict, bin_s: float = 1.0, heatmap_bins: int = 40, heatmap_columns: int = 600) -> Dict:
+    meta = data["meta"]
+    labels = meta["labels"]
+    t = np.asarray(data["t"])
+    lat = np.asarray(data["latency_ms"])
+    worker = np.asarray(data["worker"])
+    cache = np.asarray(data["cache"])
+    status = np.asarray(data["status"]).astype(np.int64)
+
+    ok_labels = [i for i, lbl in enumerate(labels) if lbl == "ok" or (lbl.isdigit() and int(lbl) < 400)]
+    ok = np.isin(status, ok_labels)
+    has_lat = np.isfinite(lat)
+    lat_ok = lat[has_lat]
+
+    result = {
+        "source": meta["source"],
+        "kind": meta["kind"],
+        "rows": int(lat.size),
+        "ok": int(ok.sum()),
+        "error_rate": float(1.0 - ok.mean()) if lat.size else 0.0,
+        "latency_ms": {"min": float(lat_ok.min()) if lat_ok.size else 0.0,
+                       "max": float(lat_ok.max()) if lat_ok.size else 0.0,
+                       "mean": float(lat_ok.mean()) if lat_ok.size else 0.0,
+                       **{f"p{q}": float(v) for q, v in
+                          zip(QUANTILES, np.percentile(lat_ok, QUANTILES) if lat_ok.size else [0.0] * len(QUANTILES))}},
+    }
+
+    # per-status
+    st = group_stats(status[has_lat], lat[has_lat], len(labels))
+    totals = np.bincount(status, minlength=len(labels))
+    result["by_status"] = [
+        {"status": labels[i], "count": int(totals[i]), **{k: float(st[k][i]) for k in ["mean"] + [f"p{q}" for q in QUANTILES]}}
+        for i in np.argsort(-totals) if totals[i]
+    ]
+
+    # per-worker, and cold vs warm cache for page-load runs (successful loads only)
+    result["by_worker"] = _breakdown(worker, lat, has_lat & (worker >= 0), "worker")
+    result["by_cache"] = _breakdown(cache, lat, has_lat & ok & (cache >= 0), "cache", CACHE_STATES)
+
+    # per-second time series and heatmap
+    tmask = np.isfinite(t)
+    if tmask.any():
+        t0 = float(t[tmask].min())
+        bins = ((t - t0) // bin_s)
+        n_bins = int(np.nanmax(bins[tmask])) + 1
+        b_all = bins[tmask].astype(np.int64)
+        sent = np.bincount(b_all, minlength=n_bins)
+        errors = np.bincount(b_all, weights=~ok[tmask], minlength=n_bins)
+        both = tmask & has_lat
+        ts = group_stats(bins[both].astype(np.int64), lat[both], n_bins)
+        result["timeseries"] = {
+            "bin_s": bin_s,
+            "throughput": (sent / bin_s).tolist(),
+            "errors": errors.astype(np.int64).tolist(),
+            "p50": ts["p50"].tolist(),
+            "p99": ts["p99"].tolist(),
+        }
+        if both.any():
+            lo = max(float(lat[both].min()), 0.01)
+            hi = max(float(lat[both].max()), lo * 1.01)
+            edges = np.geomspace(lo, hi, heatmap_bins + 1)
+            # coarsen the time axis on long runs so the SVG stays a reasonable size
+            factor = math.ceil(n_bins / heatmap_columns)
+            n_cols = math.ceil(n_bins / factor)
+            hist, _, _ = np.histogram2d(bins[both] // factor, lat[both], bins=[np.arange(n_cols + 1), edges])
+            result["heatmap"] = {"bin_s": bin_s * factor, "latency_edges_ms": edges.tolist(),
+                                 "counts": hist.astype(np.int64).tolist()}
+    return result
+
+
+# ---- HTML report ----
+
+
+def _fmt(v) -> str:
+    if isinstance(v, float):
+        return f"{v:.3f}" if abs(v) < 1000 else f"{v:.0f}"
+    return html.escape(str(v))
+
+
+def _table(rows: List[Dict], limit: int = 200) -> str:
+    if not rows:
+        return "<p>No data.</p>"
+    cols = list(rows[0])
+    body = "".join("<tr>" + "".join(f"<td>{_fmt(r[c])}</td>" for c in cols) + "</tr>" for r in rows[:limit])
+    more = f"<p>Showing {limit} of {len(rows)} rows.</p>" if len(rows) > limit else ""
+    return f"<table><tr>{''.join(f'<th>{html.escape(c)}</th>' for c in cols)}</tr>{body}</table>{more}"
+
+
+def _line_chart(series: Dict[str, List[float]], x_step: float, y_label: str, width=900, height=220) -> str:
+    colors = ["#1f77b4", "#d62728", "#2ca02c", "#ff7f0e"]
+    n = max((len(s) for s in series.values()), default=0)
+    y_max = max((max(s) for s in series.values() if s), default=0.0) or 1.0
+    pad = 40
+    sx = (width - 2 * pad) / max(1, n - 1)
+    sy = (height - 2 * pad) / y_max
+    parts = [f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">',
+             f'<line x1="{pad}" y1="{height - pad}" x2="{width - pad}" y2="{height - pad}" stroke="#888"/>',
+             f'<line x1="{pad}" y1="{pad}" x2="{pad}" y2="{height - pad}" stroke="#888"/>',
+             f'<text x="{pad}" y="{pad - 8}" font-size="11">{html.escape(y_label)} (max {y_max:.2f})</text>',
+             f'<text x="{width - pad}" y="{height - pad + 16}" font-size="11" text-anchor="end">{n * x_step:.0f}s</text>']
+    for (name, s), color in zip(series.items(), colors):
+        pts = " ".join(f"{pad + i * sx:.1f},{height - pad - v * sy:.1f}" for i, v in enumerate(s))
+        parts.append(f'<polyline fill="none" stroke="{color}" stroke-width="1.2" points="{pts}"/>')
+    legend = " ".join(f'<span style="color:{c}">&#9632; {html.escape(k)}</span>' for k, c in zip(series, colors))
+    return "".join(parts) + "</svg><div>" + legend + "</div>"
+
+
+def _heatmap(hm: Dict, width=900, height=260) -> str:
+    counts = np.asarray(hm["counts"], dtype=np.float64)
+    edges = hm["latency_edges_ms"]
+    n_x, n_y = counts.shape
+    pad = 50
+    cw = (width - 2 * pad) / max(1, n_x)
+    ch = (height - 2 * pad) / max(1, n_y)
+    scale = np.log1p(counts) / max(1e-9, np.log1p(counts.max()))
+    parts = [f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">']
+    xs, ys = np.nonzero(counts)
+    for x, y in zip(xs, ys):
+        shade = int(255 - 225 * scale[x, y])
+        parts.append(f'<rect x="{pad + x * cw:.1f}" y="{height - pad - (y + 1) * ch:.1f}" width="{cw + 0.5:.1f}" '
+                     f'height="{ch + 0.5:.1f}" fill="rgb({shade},{shade},255)"><title>{int(counts[x, y])} req, '
+                     f'{edges[y]:.1f}-{edges[y + 1]:.1f} ms, t={x * hm["bin_s"]:.0f}s</title></rect>')
+    parts.append(f'<text x="{pad - 4}" y="{height - pad}" font-size="11" text-anchor="end">{edges[0]:.1f}ms</text>')
+    parts.append(f'<text x="{pad - 4}" y="{pad + 10}" font-size="11" text-anchor="end">{edges[-1]:.0f}ms</text>')
+    parts.append(f'<text x="{width - pad}" y="{height - pad + 16}" font-size="11" text-anchor="end">'
+                 f'{n_x * hm["bin_s"]:.0f}s</text>')
+    return "".join(parts) + "</svg>"
+
+
+def render_html(results: List[Dict]) -> str:
+    sections = []
+    for r in results:
+        overall = [{"rows": r["rows"], "ok": r["ok"], "error_rate": r["error_rate"], **r["latency_ms"]}]
+        s = [f"<h2>{html.escape(os.path.basename(r['source']))} <small>({r['kind']})</small></h2>",
+             "<h3>Overall latency (ms)</h3>", _table(overall)]
+        if "timeseries" in r:
+            ts = r["timeseries"]
+            s += ["<h3>Throughput per second</h3>",
+                  _line_chart({"req/s": ts["throughput"], "errors": ts["errors"]}, ts["bin_s"], "requests"),
+                  "<h3>Latency over time (ms)</h3>",
+                  _line_chart({"p50": ts["p50"], "p99": ts["p99"]}, ts["bin_s"], "latency ms")]
+        if "heatmap" in r:
+            s += ["<h3>Latency heatmap (log scale)</h3>", _heatmap(r["heatmap"])]
+        s += ["<h3>By status</h3>", _table(r["by_status"])]
+        if r["by_cache"]:
+            s += ["<h3>Page load by cache state (successful loads)</h3>", _table(r["by_cache"])]
+        if r["by_worker"]:
+            s += ["<h3>By worker</h3>", _table(r["by_worker"])]
+        sections.append("\n".join(s))
+    style = ("body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;font-size:12px}"
+             "td,th{border:1px solid #ccc;padding:2px 6px;text-align:right}")
+    return (f"<!doctype html><html><head><meta charset='utf-8'><title>Benchmark report</title>"
+            f"<style>{style}</style></head><body><h1>Benchmark report</h1>{''.join(sections)}</body></html>")
+
+
+# ---- CLI ----
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Analyze benchmark result CSVs and write an HTML report.")
+    p.add_argument("inputs", nargs="+", help="Result CSV files (or .cols cache directories)")
+    p.add_argument("-o", "--out", default="report.html", help="HTML report path (default: report.html)")
+    p.add_argument("--json", default=None, help="Optional JSON summary path")
+    p.add_argument("--bin", type=float, default=1.0, help="Time series bin width in seconds (default: 1)")
+    p.add_argument("--no-cache", action="store_true", help="Re-convert CSVs even if a columnar cache exists")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    results = []
+    for path in args.inputs:
+        t0 = time.perf_counter()
+        try:
+            data = load_columns(path, use_cache=not args.no_cache)
+        except (OSError, ValueError) as e:
+            print(f"Failed to load {path}: {e}", file=sys.stderr)
+            continue
+        results.append(analyze(data, bin_s=args.bin))
+        print(f"Analyzed {data['meta']['rows']} rows from {path} in {time.perf_counter() - t0:.2f}s")
+
+    if not results:
+        sys.exit(1)
+    with open(args.out, "w", encoding="utf-8") as f:
+        f.write(render_html(results))
+    print(f"Wrote HTML report to {args.out}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([{k: v for k, v in r.items() if k not in ("heatmap", "timeseries")} for r in results], f, indent=2)
+        print(f"Wrote JSON summary to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
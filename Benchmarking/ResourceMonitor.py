@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Client-side resource monitor for the asyncio benchmark scripts.
+
+Both StaticBenchmark.py and WebsocketBenchmark.py drive every request from a single event loop.
+Once that loop is overloaded, measured latencies include time spent waiting to be scheduled,
+so the numbers describe the load generator rather than the server under test.
+
+LoopMonitor runs as a background task next to the workers and samples:
+- event-loop lag (how late a timer fires compared to when it was scheduled)
+- process CPU usage (percent of one core)
+- resident set size (RSS)
+- open sockets
+
+At the end of the run, summary() reports these alongside the latency stats and flags the run
+as saturated when the client itself was the bottleneck.
+
+Optional dependencies:
+    pip install psutil    # more accurate RSS / socket counts; falls back to the stdlib otherwise
+
+Profiling:
+    run_profiled() wraps asyncio.run() in cProfile so the hot path of the harness itself can be
+    inspected with `python -m pstats <file>` or snakeviz.
+"""
+import asyncio
+import cProfile
+import os
+import pstats
+import sys
+import time
+from typing import Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:  # psutil is optional
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+# ---- Helpers ----
+
+
+def percentile(sorted_list: List[float], p: float) -> float:
+    if not sorted_list:
+        return 0.0
+    k = (len(sorted_list) - 1) * (p / 100.0)
+    f = int(k)
+    c = min(f + 1, len(sorted_list) - 1)
+    if f == c:
+        return sorted_list[int(k)]
+    d0 = sorted_list[f] * (c - k)
+    d1 = sorted_list[c] * (k - f)
+    return d0 + d1
+
+
+def _rss_bytes(proc) -> int:
+    if proc is not None:
+        return proc.memory_info().rss
+    try:
+        # Linux: second field of statm is resident pages
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        # ru_maxrss is the peak, in KiB on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    return 0
+
+
+def _open_sockets(proc) -> int:
+    if proc is not None:
+        try:
+            conns = proc.net_connections() if hasattr(proc, "net_connections") else proc.connections()
+            return len(conns)
+        except (psutil.AccessDenied, psutil.NoSuchProcess):
+            return 0
+    try:
+        fd_dir = "/proc/self/fd"
+        count = 0
+        for fd in os.listdir(fd_dir):
+            try:
+                if os.readlink(os.path.join(fd_dir, fd)).startswith("socket:"):
+                    count += 1
+            except OSError:
+                continue
+        return count
+    except OSError:
+        return 0
+
+
+def _cpu_seconds() -> float:
+    t = os.times()
+    return t.user + t.system
+
+
+# ---- Monitor ----
+
+
+class LoopMonitor:
+    """
+    Samples event-loop lag and process resources every `interval` seconds.
+
+    A run is marked saturated when the p99 loop lag exceeds `lag_threshold_ms` or the mean CPU
+    usage exceeds `cpu_threshold` percent of one core. With fewer than `min_samples` lag samples the
+    run was too short to judge, and it is reported as not valid rather than as healthy.
+    """
+
+    def __init__(self, interval: float = 0.1, lag_threshold_ms: float = 50.0, cpu_threshold: float = 90.0,
+                 min_samples: int = 5):
+        self.interval = max(0.001, interval)
+        self.lag_threshold_ms = lag_threshold_ms
+        self.cpu_threshold = cpu_threshold
+        self.min_samples = max(1, min_samples)
+
+        self._task: Optional[asyncio.Task] = None
+        self._proc = psutil.Process() if psutil is not None else None
+        self._last_wall = time.monotonic()
+        self._last_cpu = _cpu_seconds()
+
+        self.lag_ms: List[float] = []
+        self.cpu_percent: List[float] = []
+        self.rss_bytes: List[int] = []
+        self.open_sockets: List[int] = []
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._sample_loop())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # final sample so runs shorter than one interval still report RSS / sockets; CPU over a
+        # window much shorter than the interval is too noisy to judge saturation by
+        self._sample_resources(min_wall=self.interval / 2)
+
+    def _sample_resources(self, min_wall: float = 0.0):
+        now_wall = time.monotonic()
+        now_cpu = _cpu_seconds()
+        wall = now_wall - self._last_wall
+        if wall > 0 and wall >= min_wall:
+            self.cpu_percent.append((now_cpu - self._last_cpu) / wall * 100.0)
+        self._last_wall, self._last_cpu = now_wall, now_cpu
+
+        self.rss_bytes.append(_rss_bytes(self._proc))
+        self.open_sockets.append(_open_sockets(self._proc))
+
+    async def _sample_loop(self):
+        loop = asyncio.get_running_loop()
+        self._last_wall = time.monotonic()
+        self._last_cpu = _cpu_seconds()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag_ms.append(max(0.0, (loop.time() - expected) * 1000.0))
+            self._sample_resources()
+
+    def summary(self) -> Dict:
+        lag_sorted = sorted(self.lag_ms)
+        cpu_mean = (sum(self.cpu_percent) / len(self.cpu_percent)) if self.cpu_percent else 0.0
+        lag_p99 = percentile(lag_sorted, 99)
+
+        reasons = []
+        if lag_p99 > self.lag_threshold_ms:
+            reasons.append(f"event-loop lag p99 {lag_p99:.1f} ms > {self.lag_threshold_ms:.1f} ms")
+        if cpu_mean > self.cpu_threshold:
+            reasons.append(f"mean CPU {cpu_mean:.1f}% > {self.cpu_threshold:.1f}%")
+
+        insufficient = len(self.lag_ms) < self.min_samples
+        return {
+            "samples": len(self.lag_ms),
+            "min_samples": self.min_samples,
+            "interval_s": self.interval,
+            "loop_lag_ms": {
+                "mean": (sum(lag_sorted) / len(lag_sorted)) if lag_sorted else 0.0,
+                "p50": percentile(lag_sorted, 50),
+                "p99": lag_p99,
+                "max": lag_sorted[-1] if lag_sorted else 0.0,
+            },
+            "cpu_percent": {
+                "mean": cpu_mean,
+                "max": max(self.cpu_percent) if self.cpu_percent else 0.0,
+            },
+            "rss_mb_max": (max(self.rss_bytes) / (1024 * 1024)) if self.rss_bytes else 0.0,
+            "open_sockets_max": max(self.open_sockets) if self.open_sockets else 0,
+            "saturated": bool(reasons),
+            "saturation_reasons": reasons,
+            "insufficient_samples": insufficient,
+            "valid": not reasons and not insufficient,
+        }
+
+
+def print_client_summary(client: Dict):
+    print("\n=== Load Generator Health ===")
+    lag = client["loop_lag_ms"]
+    cpu = client["cpu_percent"]
+    print(f"Event-loop lag (ms): p50 {lag['p50']:.2f}, p99 {lag['p99']:.2f}, max {lag['max']:.2f}")
+    print(f"CPU (% of one core): mean {cpu['mean']:.1f}, max {cpu['max']:.1f}")
+    print(f"Peak RSS: {client['rss_mb_max']:.1f} MB, peak open sockets: {client['open_sockets_max']}")
+    if client.get("server_in_process"):
+        print("Note: the server under test ran in this process, so lag and CPU include its work; run it with "
+              "--server-only and benchmark with --client-only to isolate the client.")
+    if client["saturated"]:
+        print("WARNING: load generator was saturated; latencies include client-side scheduling delay.")
+        for reason in client["saturation_reasons"]:
+            print(f"  - {reason}")
+    elif client["insufficient_samples"]:
+        print(f"WARNING: only {client['samples']} loop-lag samples (need {client['min_samples']}); the run was too "
+              f"short to tell whether the load generator was saturated. Run longer or lower --monitor-interval.")
+    else:
+        print("Load generator was not saturated.")
+
+
+# ---- Profiling hook ----
+
+
+def run_profiled(coro, profile_out: Optional[str], top: int = 25):
+    """
+    Run `coro` with asyncio.run(), optionally under cProfile.
+    When profile_out is set, raw stats are dumped there and the top entries by cumulative time are printed.
+    """
+    if not profile_out:
+        return asyncio.run(coro)
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return asyncio.run(coro)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(profile_out)
+        print(f"\nWrote harness profile to {profile_out}")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
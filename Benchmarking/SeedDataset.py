@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Synthetic dataset generator and bulk seeder for benchmark targets.
+
+Benchmarks against /training/[id] and /instructor/[id] mean little on an empty database: those pages load
+the training, its learner and instructor users and every score_sheet row of the training, so their cost
+grows with data size. This script builds a realistic dataset for them.
+
+- Table and column names are read from prisma/schema.prisma (@@map / @map), so the generated tables match
+  what the app queries through Kysely.
+- Rows are bulk-loaded into a local SQLite database (a stand-in for Azure SQL) with batched multi-row
+  INSERT statements inside a single transaction; indexes are built after the load.
+- Distributions are skewed the way real data is: a few instructors and learners own most trainings,
+  past trainings are mostly COMPLETED, and the number of score sheets per training is heavy-tailed.
+- ID lists (instructor / learner / training ids) are written out for the benchmark scenarios, e.g.
+  StaticBenchmark.py https://<app>/training/{id} --ids ids/training_ids.txt
+
+No third-party dependencies.
+
+Example usage:
+    python SeedDataset.py --db seed.sqlite --users 1000000 --trainings 5000000 --ids-dir ids
+"""
+import argparse
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+DEFAULT_SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "prisma", "schema.prisma")
+
+SCALAR_TYPES = {"String": "TEXT", "Int": "INTEGER", "BigInt": "INTEGER", "Boolean": "INTEGER",
+                "DateTime": "TEXT", "Float": "REAL", "Decimal": "REAL"}
+
+FIRST_NAMES = ["Chan", "Wong", "Lee", "Cheung", "Lau", "Ho", "Ng", "Leung", "Lam", "Tam", "Yip", "Kwok",
+               "Alex", "Ben", "Cathy", "Daisy", "Eric", "Fiona", "Gary", "Helen", "Ivan", "Jenny", "Kelvin", "Mandy"]
+LAST_NAMES = ["Chan", "Wong", "Lee", "Cheung", "Lau", "Ho", "Ng", "Leung", "Lam", "Tam", "Yip", "Kwok",
+              "Tsang", "Chow", "Fung", "Mak", "Yuen", "Choi", "Siu", "Poon"]
+
+# Mirrors src/routes/training/[id]/scoresheet.ts (73 items, of which these are serious faults) and
+# ScoreSheet.svelte: part B covers items 1-55 and never offers item 50, part C covers items 20-73
+SCORE_ITEMS = 73
+SERIOUS_ITEMS = [11, 12, 16, 19, 27, 28, 29, 30, 35, 40, 41, 42, 49, 56, 57, 62, 64, 66, 67, 68]
+PART_ITEMS = {
+    "partB": [i for i in range(1, 56) if i != 50],
+    "partC": list(range(20, SCORE_ITEMS + 1)),
+}
+PART_CANDIDATES = {
+    part: ([i for i in items if i not in SERIOUS_ITEMS], [i for i in items if i in SERIOUS_ITEMS])
+    for part, items in PART_ITEMS.items()
+}
+
+
+# ---- Prisma schema ----
+
+
+def parse_prisma_schema(path: str) -> Dict[str, Dict]:
+    """
+    Minimal parser for the subset of Prisma schema syntax used in prisma/schema.prisma.
+    Returns {model_name: {"table": str, "fields": [field...], "foreign_keys": [field_name...]}} where each
+    field is {"name", "column", "type", "optional", "id", "unique"}. Relation fields are dropped.
+    """
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    blocks = re.findall(r"^model\s+(\w+)\s*\{(.*?)^\}", text, flags=re.M | re.S)
+    model_names = {name for name, _ in blocks}
+
+    models = {}
+    for name, body in blocks:
+        table = name
+        fields = []
+        foreign_keys = []
+        for raw in body.splitlines():
+            line = raw.split("//", 1)[0].strip()
+            if not line:
+                continue
+            if line.startswith("@@"):
+                m = re.match(r'@@map\("([^"]+)"\)', line)
+                if m:
+                    table = m.group(1)
+                continue
+            parts = line.split(None, 2)
+            if len(parts) < 2:
+                continue
+            fname, ftype = parts[0], parts[1]
+            attrs = parts[2] if len(parts) > 2 else ""
+            base = ftype.rstrip("?[]")
+            if base in model_names:
+                m = re.search(r"fields:\s*\[([^\]]+)\]", attrs)
+                if m:
+                    foreign_keys.extend(x.strip() for x in m.group(1).split(","))
+                continue
+            if base not in SCALAR_TYPES or ftype.endswith("[]"):
+                continue
+            m = re.search(r'@map\("([^"]+)"\)', attrs)
+            fields.append({
+                "name": fname,
+                "column": m.group(1) if m else fname,
+                "type": base,
+                "optional": ftype.endswith("?"),
+                "id": "@id" in attrs,
+                "unique": "@unique" in attrs,
+            })
+        models[name] = {"table": table, "fields": fields, "foreign_keys": foreign_keys}
+    return models
+
+
+def create_tables(conn: sqlite3.Connection, models: Dict[str, Dict]):
+    for model in models.values():
+        cols = []
+        for f in model["fields"]:
+            col = f'"{f["column"]}" {SCALAR_TYPES[f["type"]]}'
+            if f["id"]:
+                col += " PRIMARY KEY"
+            elif not f["optional"]:
+                col += " NOT NULL"
+            cols.append(col)
+        conn.execute(f'DROP TABLE IF EXISTS "{model["table"]}"')
+        conn.execute(f'CREATE TABLE "{model["table"]}" ({", ".join(cols)})')
+
+
+def create_indexes(conn: sqlite3.Connection, models: Dict[str, Dict], foreign_key_indexes: bool):
+    for model in models.values():
+        by_name = {f["name"]: f for f in model["fields"]}
+        for f in model["fields"]:
+            if f["unique"]:
+                conn.execute(f'CREATE UNIQUE INDEX "{model["table"]}_{f["column"]}_key" '
+                             f'ON "{model["table"]}" ("{f["column"]}")')
+        if not foreign_key_indexes:
+            continue
+        for fk in model["foreign_keys"]:
+            f = by_name.get(fk)
+            if f is None or f["id"] or f["unique"]:
+                continue
+            conn.execute(f'CREATE INDEX "{model["table"]}_{f["column"]}_idx" '
+                         f'ON "{model["table"]}" ("{f["column"]}")')
+
+
+# ---- Bulk loading ----
+
+
+def _max_sql_variables() -> int:
+    # SQLITE_MAX_VARIABLE_NUMBER was raised from 999 to 32766 in SQLite 3.32
+    return 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+
+class BulkWriter:
+    """
+    Buffers rows for one model and writes them with multi-row INSERT statements
+    (INSERT INTO t (...) VALUES (...), (...), ...), executemany'd over full chunks.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, model: Dict, rows_per_statement: int = 500,
+                 statements_per_flush: int = 20):
+        self.conn = conn
+        self.table = model["table"]
+        self.field_names = [f["name"] for f in model["fields"]]
+        columns = ", ".join(f'"{f["column"]}"' for f in model["fields"])
+        self._prefix = f'INSERT INTO "{self.table}" ({columns}) VALUES '
+        self._row_sql = "(" + ", ".join("?" for _ in self.field_names) + ")"
+        self.rows_per_statement = max(1, min(rows_per_statement, _max_sql_variables() // len(self.field_names)))
+        self._full_sql = self._statement(self.rows_per_statement)
+        self._flush_at = self.rows_per_statement * statements_per_flush
+        self._buffer: List = []
+        self._buffered_rows = 0
+        self.rows_written = 0
+
+    def _statement(self, n_rows: int) -> str:
+        return self._prefix + ", ".join(self._row_sql for _ in range(n_rows))
+
+    def add(self, row: Dict):
+        self._buffer.extend(row.get(name) for name in self.field_names)
+        self._buffered_rows += 1
+        if self._buffered_rows >= self._flush_at:
+            self.flush()
+
+    def flush(self):
+        if not self._buffered_rows:
+            return
+        width = len(self.field_names)
+        chunk = self.rows_per_statement * width
+        full = len(self._buffer) // chunk
+        if full:
+            self.conn.executemany(self._full_sql, (self._buffer[i * chunk:(i + 1) * chunk] for i in range(full)))
+        rest = self._buffer[full * chunk:]
+        if rest:
+            self.conn.execute(self._statement(len(rest) // width), rest)
+        self.rows_written += self._buffered_rows
+        self._buffer = []
+        self._buffered_rows = 0
+
+
+# ---- Data generation ----
+
+
+_DAY_CACHE: Dict[int, str] = {}
+
+
+def _fmt(ts: float) -> str:
+    """UTC timestamp as 'YYYY-MM-DD HH:MM:SS.mmm'; the date part is cached since strftime dominates otherwise."""
+    ms = int(ts * 1000)
+    day, ms_of_day = divmod(ms, 86400000)
+    date = _DAY_CACHE.get(day)
+    if date is None:
+        date = _DAY_CACHE[day] = datetime.fromtimestamp(day * 86400, tz=timezone.utc).strftime("%Y-%m-%d")
+    secs, msec = divmod(ms_of_day, 1000)
+    mins, sec = divmod(secs, 60)
+    hour, minute = divmod(mins, 60)
+    return f"{date} {hour:02d}:{minute:02d}:{sec:02d}.{msec:03d}"
+
+
+def _uuid(rng: random.Random) -> str:
+    """Random (version 4) UUID string, reproducible from rng."""
+    n = rng.getrandbits(128)
+    n = (n & ~(0xF000 << 64) | (0x4000 << 64)) & ~(0xC000 << 48) | (0x8000 << 48)
+    h = f"{n:032x}"
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _skewed_cum_weights(rng: random.Random, n: int, alpha: float) -> List[float]:
+    """Pareto-distributed popularity weights, as cumulative weights for random.choices()."""
+    total = 0.0
+    cum = []
+    for _ in range(n):
+        total += rng.paretovariate(alpha)
+        cum.append(total)
+    return cum
+
+
+def _poisson(rng: random.Random, lam: float) -> int:
+    if lam <= 0:
+        return 0
+    if lam > 30:
+        return max(0, int(round(rng.gauss(lam, math.sqrt(lam)))))
+    limit = math.exp(-lam)
+    k, p = 0, rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def _score_sheet_pool(rng: random.Random, size: int = 4096) -> List[str]:
+    """Pre-rendered score sheet payloads; drawing from a pool keeps JSON encoding off the per-row path."""
+    return [_score_sheet_data(rng) for _ in range(size)]
+
+
+def _score_sheet_data(rng: random.Random) -> str:
+    def part(name):
+        minor, serious = PART_CANDIDATES[name]
+        return {
+            "minor": sorted(rng.sample(minor, min(len(minor), _poisson(rng, 3)))),
+            "serious": sorted(rng.sample(serious, min(len(serious), _poisson(rng, 0.3)))),
+        }
+    remarks = rng.choice(["", "", "", "Good progress", "Needs more practice on hill starts",
+                          "Check mirrors more often", "Ready for test"])
+    return json.dumps({"partB": part("partB"), "partC": part("partC"), "remarks": remarks}, separators=(",", ":"))
+
+
+class IdSink:
+    """Writes one id per line to <ids_dir>/<name>_ids.txt, or discards ids when ids_dir is None."""
+
+    def __init__(self, ids_dir: Optional[str], name: str):
+        self.path = os.path.join(ids_dir, f"{name}_ids.txt") if ids_dir else None
+        self._f = open(self.path, "w", encoding="utf-8") if self.path else None
+
+    def write(self, value: str):
+        if self._f:
+            self._f.write(value)
+            self._f.write("\n")
+
+    def close(self):
+        if self._f:
+            self._f.close()
+
+
+def seed(conn: sqlite3.Connection, models: Dict[str, Dict], users: int, instructor_ratio: float,
+         trainings: int, sheets_per_training: float, availability_per_instructor: float,
+         ids_dir: Optional[str], seed_value: int) -> Dict[str, int]:
+    rng = random.Random(seed_value)
+    now = time.time()
+    year = 365 * 86400.0
+
+    writers = {name: BulkWriter(conn, models[name]) for name in
+               ("User", "Instructor", "Learner", "InstructorAvailability", "Training", "ScoreSheet")}
+    sinks = {name: IdSink(ids_dir, name) for name in ("instructor", "learner", "training")}
+
+    sheet_pool = _score_sheet_pool(rng)
+
+    # at least one of each so trainings can be generated; the two always add up to `users`
+    n_instructors = min(max(1, int(users * instructor_ratio)), users - 1)
+    n_learners = users - n_instructors
+    instructor_ids: List[str] = []
+    learner_ids: List[str] = []
+
+    # Users, with their instructor / learner profile rows
+    for i in range(n_instructors + n_learners):
+        is_instructor = i < n_instructors
+        uid = _uuid(rng)
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        created = now - rng.random() * 2 * year
+        writers["User"].add({
+            "id": uid,
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}.{i}@example.com",
+            "emailVerified": 1 if rng.random() < 0.8 else 0,
+            "image": None if rng.random() < 0.7 else f"https://example.com/avatars/{uid}.png",
+            "role": "INSTRUCTOR" if is_instructor else "LEARNER",
+            "createdAt": _fmt(created),
+            "updatedAt": _fmt(created + rng.random() * (now - created)),
+        })
+        if is_instructor:
+            instructor_ids.append(uid)
+            sinks["instructor"].write(uid)
+            writers["Instructor"].add({"userId": uid, "bookingLeadingTime": rng.choice([15, 30, 30, 30, 60, 120])})
+            for _ in range(_poisson(rng, availability_per_instructor)):
+                start = math.floor((now + rng.uniform(-0.1, 0.25) * year) / 1800) * 1800
+                writers["InstructorAvailability"].add({
+                    "id": _uuid(rng),
+                    "instructorId": uid,
+                    "startTime": _fmt(start),
+                    "endTime": _fmt(start + rng.choice([2, 3, 4, 6, 8]) * 1800),
+                })
+        else:
+            learner_ids.append(uid)
+            sinks["learner"].write(uid)
+            writers["Learner"].add({
+                "userId": uid,
+                "licenseNumber": f"{rng.choice('ABCDEFGHJKLMNPRSTUVWXYZ')}{i:09d}",
+                "licenseExpiry": _fmt(now + rng.uniform(-0.2, 5) * year),
+            })
+
+    # Trainings: a small share of instructors and learners own most bookings
+    instructor_weights = _skewed_cum_weights(rng, len(instructor_ids), 1.2)
+    learner_weights = _skewed_cum_weights(rng, len(learner_ids), 2.0)
+    batch = 10000
+    remaining = trainings
+    while remaining > 0:
+        k = min(batch, remaining)
+        remaining -= k
+        instructors = rng.choices(instructor_ids, cum_weights=instructor_weights, k=k)
+        learners = rng.choices(learner_ids, cum_weights=learner_weights, k=k)
+        for instructor_id, learner_id in zip(instructors, learners):
+            tid = _uuid(rng)
+            day = math.floor((now + rng.uniform(-1.0, 0.25) * year) / 86400) * 86400
+            start = day + rng.randint(8, 20) * 3600
+            end = start + rng.choice([3600, 3600, 5400, 7200])
+            created = min(start, now) - rng.uniform(1, 30) * 86400
+            past = end < now
+            if past:
+                status = "COMPLETED" if rng.random() < 0.85 else "CANCELLED"
+            else:
+                status = "CONFIRMED" if rng.random() < 0.8 else "PENDING"
+            writers["Training"].add({
+                "id": tid,
+                "instructorId": instructor_id,
+                "learnerId": learner_id,
+                "startTime": _fmt(start),
+                "endTime": _fmt(end),
+                "status": status,
+                "createdAt": _fmt(created),
+                "updatedAt": _fmt(min(now, end)),
+            })
+            sinks["training"].write(tid)
+
+            # Heavy-tailed sheet count; only trainings that already happened have sheets
+            if status != "COMPLETED" or sheets_per_training <= 0:
+                continue
+            n_sheets = int(rng.lognormvariate(math.log(sheets_per_training) - 0.5, 1.0))
+            for _ in range(n_sheets):
+                sheet_ts = start + rng.random() * (end - start)
+                writers["ScoreSheet"].add({
+                    "id": _uuid(rng),
+                    "trainingId": tid,
+                    "data": rng.choice(sheet_pool),
+                    "createdAt": _fmt(sheet_ts),
+                    "updatedAt": _fmt(sheet_ts + rng.random() * 600),
+                })
+
+    for w in writers.values():
+        w.flush()
+    for s in sinks.values():
+        s.close()
+    return {w.table: w.rows_written for w in writers.values()}
+
+
+# ---- CLI ----
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Generate and bulk-load a synthetic dataset for benchmarking.")
+    p.add_argument("--schema", default=DEFAULT_SCHEMA, help="Path to schema.prisma (default: ../prisma/schema.prisma)")
+    p.add_argument("--db", default="seed.sqlite", help="SQLite database file to (re)create (default: seed.sqlite)")
+    p.add_argument("--users", type=int, default=100000, help="Total users, at least 2 (default: 100000)")
+    p.add_argument("--instructor-ratio", type=float, default=0.02, help="Share of users that are instructors (default: 0.02)")
+    p.add_argument("--trainings", type=int, default=500000, help="Total trainings (default: 500000)")
+    p.add_argument("--sheets-per-training", type=float, default=3.0,
+                   help="Mean score sheets per completed training (default: 3)")
+    p.add_argument("--availability-per-instructor", type=float, default=20.0,
+                   help="Mean availability slots per instructor (default: 20)")
+    p.add_argument("--ids-dir", default=None, help="Directory to write instructor/learner/training id lists to")
+    p.add_argument("--no-fk-indexes", action="store_true",
+                   help="Do not index foreign key columns (Prisma does not create them on SQL Server)")
+    p.add_argument("--seed", type=int, default=4651, help="Random seed (default: 4651)")
+    args = p.parse_args()
+    if args.users < 2:
+        p.error("--users must be at least 2 (trainings need an instructor and a learner)")
+    return args
+
+
+def main():
+    args = parse_args()
+    models = parse_prisma_schema(args.schema)
+    missing = {"User", "Instructor", "Learner", "InstructorAvailability", "Training", "ScoreSheet"} - set(models)
+    if missing:
+        print(f"Schema {args.schema} is missing models: {', '.join(sorted(missing))}", file=sys.stderr)
+        sys.exit(1)
+    if args.ids_dir:
+        os.makedirs(args.ids_dir, exist_ok=True)
+
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    conn.execute("PRAGMA cache_size=-262144")
+
+    print(f"Seeding {args.db}: {args.users} users, {args.trainings} trainings")
+    t0 = time.perf_counter()
+    conn.execute("BEGIN")
+    create_tables(conn, models)
+    counts = seed(conn, models, args.users, args.instructor_ratio, args.trainings, args.sheets_per_training,
+                  args.availability_per_instructor, args.ids_dir, args.seed)
+    conn.execute("COMMIT")
+    t_load = time.perf_counter() - t0
+
+    create_indexes(conn, models, foreign_key_indexes=not args.no_fk_indexes)
+    conn.close()
+    elapsed = time.perf_counter() - t0
+
+    total_rows = sum(counts.values())
+    print("\n=== Seed Summary ===")
+    for table, n in counts.items():
+        print(f"  {table:<24} {n:>12}")
+    print(f"Rows loaded: {total_rows} in {t_load:.2f}s ({total_rows / max(t_load, 1e-9):.0f} rows/sec)")
+    print(f"Total time including indexes: {elapsed:.2f}s")
+    if args.ids_dir:
+        print(f"Wrote id lists to {args.ids_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,47 +8,63 @@ Features:
 - Control by total requests OR duration
 - Rate limiting (approx) per worker
 - Collects latencies, status codes, errors; prints summary and writes CSV/JSON
+- Monitors event-loop lag, CPU, RSS and open sockets; flags runs where the client was the bottleneck
+- Optional id list (--ids, e.g. from SeedDataset.py): each request substitutes a random id for {id} in the URL
+- Browser-like page-load mode (--page-load): fetches the HTML, then its linked JS/CSS/icons concurrently with
+  per-origin connection limits; warm visits honour Cache-Control freshness and revalidate stale entries with
+  If-None-Match; reports cold vs warm page-load time
+- Optional cProfile hook for profiling the harness itself (--profile)
 - Graceful shutdown on Ctrl+C
 
 Install dependencies:
     pip install httpx[http2] tqdm
+    pip install psutil  # optional, more accurate resource sampling
 
 Example usage:
     python bench_swa_load_test.py https://example.azurestaticapps.net/api/health -c 200 -n 20000 --http2 --timeout 10 --csv out.csv
+    python bench_swa_load_test.py https://example.azurestaticapps.net/ -c 20 -n 500 --page-load --warm-visits 3
 """
 import argparse
 import asyncio
 import csv
 import json
+import random
+import re
 import signal
 import sys
 import time
 from collections import Counter, defaultdict
-from typing import List, Optional
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
 
 import httpx
 from tqdm import tqdm
 
+from ResourceMonitor import LoopMonitor, percentile, print_client_summary, run_profiled
+
 # ---- Helpers ----
 
 
-def percentile(sorted_list: List[float], p: float) -> float:
-    if not sorted_list:
-        return 0.0
-    k = (len(sorted_list) - 1) * (p / 100.0)
-    f = int(k)
-    c = min(f + 1, len(sorted_list) - 1)
-    if f == c:
-        return sorted_list[int(k)]
-    d0 = sorted_list[f] * (c - k)
-    d1 = sorted_list[c] * (k - f)
-    return d0 + d1
+def latency_stats(values: List[float]) -> dict:
+    lat_sorted = sorted(values)
+    return {
+        "min": lat_sorted[0] if lat_sorted else 0.0,
+        "max": lat_sorted[-1] if lat_sorted else 0.0,
+        "mean": (sum(lat_sorted) / len(lat_sorted)) if lat_sorted else 0.0,
+        "p50": percentile(lat_sorted, 50),
+        "p90": percentile(lat_sorted, 90),
+        "p95": percentile(lat_sorted, 95),
+        "p99": percentile(lat_sorted, 99),
+    }
 
 
 # ---- Benchmark runner ----
 
 
 class BenchRunner:
+    csv_fields = ["ts", "worker", "latency_ms", "status_code", "size_bytes", "target_id", "error"]
+
     def __init__(
         self,
         url: str,
@@ -63,6 +79,8 @@ class BenchRunner:
         rate_per_worker: Optional[float],
         csv_out: Optional[str],
         json_out: Optional[str],
+        monitor: Optional[LoopMonitor] = None,
+        ids: Optional[List[str]] = None,
     ):
         self.url = url
         self.concurrency = max(1, concurrency)
@@ -76,6 +94,8 @@ class BenchRunner:
         self.rate_per_worker = rate_per_worker
         self.csv_out = csv_out
         self.json_out = json_out
+        self.monitor = monitor
+        self.ids = ids or None
 
         self._start_time = None
         self._stop_event = asyncio.Event()
@@ -106,6 +126,13 @@ class BenchRunner:
             self._counter += 1
             return self._counter
 
+    def _pick_target(self) -> Tuple[str, str]:
+        """Return (url, id): with --ids, a random id substituted for {id}; otherwise the fixed URL and ''."""
+        if not self.ids:
+            return self.url, ""
+        target_id = random.choice(self.ids)
+        return self.url.replace("{id}", target_id), target_id
+
     async def _worker(self, client: httpx.AsyncClient, pbar: Optional[tqdm] = None, worker_id: int = 0):
         while await self._should_continue():
             n = await self._increment_counter()
@@ -113,9 +140,10 @@ class BenchRunner:
             if self.total_requests is not None and n > self.total_requests:
                 break
 
+            url, target_id = self._pick_target()
             t0 = time.monotonic()
             try:
-                resp = await client.request(self.method, self.url, headers=self.headers, data=self.data, timeout=self.timeout)
+                resp = await client.request(self.method, url, headers=self.headers, data=self.data, timeout=self.timeout)
                 latency_ms = (time.monotonic() - t0) * 1000.0
                 self.latencies_ms.append(latency_ms)
                 self.status_counter[str(resp.status_code)] += 1
@@ -125,9 +153,11 @@ class BenchRunner:
                 self.records.append(
                     {
                         "ts": time.time(),
+                        "worker": worker_id,
                         "latency_ms": round(latency_ms, 3),
                         "status_code": resp.status_code,
                         "size_bytes": len(resp.content) if resp.content is not None else 0,
+                        "target_id": target_id,
                     }
                 )
             except Exception as exc:
@@ -135,7 +165,8 @@ class BenchRunner:
                 self.latencies_ms.append(latency_ms)
                 self.errors_counter[type(exc).__name__] += 1
                 self.records.append(
-                    {"ts": time.time(), "latency_ms": round(latency_ms, 3), "status_code": None, "error": str(exc)}
+                    {"ts": time.time(), "worker": worker_id, "latency_ms": round(latency_ms, 3), "status_code": None,
+                     "target_id": target_id, "error": str(exc)}
                 )
             if pbar:
                 pbar.update(1)
@@ -147,15 +178,19 @@ class BenchRunner:
         # worker ends
         return
 
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(max_keepalive_connections=self.concurrency * 2, max_connections=self.concurrency * 4)
+
     async def run(self):
         # Setup client
-        limits = httpx.Limits(max_keepalive_connections=self.concurrency * 2, max_connections=self.concurrency * 4)
-        async with httpx.AsyncClient(http2=self.http2, limits=limits, trust_env=True) as client:
+        async with httpx.AsyncClient(http2=self.http2, limits=self._limits(), trust_env=True) as client:
             # prepare progress bar if total_requests is known
             total_for_pbar = self.total_requests if self.total_requests is not None else None
             pbar = tqdm(total=total_for_pbar, unit="req", desc="requests", leave=True) if total_for_pbar else None
 
             self._start_time = time.monotonic()
+            if self.monitor:
+                self.monitor.start()
 
             # Configure graceful stop on signal (in case running in blocking loop)
             loop = asyncio.get_running_loop()
@@ -186,6 +221,8 @@ class BenchRunner:
             finally:
                 if pbar:
                     pbar.close()
+                if self.monitor:
+                    await self.monitor.stop()
                 # compute stats
                 self._stop_event.set()
 
@@ -194,41 +231,28 @@ class BenchRunner:
         total_errs = sum(self.errors_counter.values())
         elapsed = max(1e-6, time.monotonic() - (self._start_time or time.monotonic()))
         rps = total_reqs / elapsed
-        lat_sorted = sorted(self.latencies_ms)
-        return {
+        summary = {
             "total_requests_recorded": total_reqs,
             "total_errors": total_errs,
             "by_status": dict(self.status_counter),
             "by_error": dict(self.errors_counter),
             "requests_per_second": rps,
-            "latency_ms": {
-                "min": min(lat_sorted) if lat_sorted else 0.0,
-                "max": max(lat_sorted) if lat_sorted else 0.0,
-                "mean": (sum(lat_sorted) / len(lat_sorted)) if lat_sorted else 0.0,
-                "p50": percentile(lat_sorted, 50),
-                "p90": percentile(lat_sorted, 90),
-                "p95": percentile(lat_sorted, 95),
-                "p99": percentile(lat_sorted, 99),
-            },
+            "latency_ms": latency_stats(self.latencies_ms),
         }
+        if self.monitor:
+            summary["client"] = self.monitor.summary()
+            summary["valid"] = summary["client"]["valid"]
+        return summary
 
     def write_outputs(self):
         summary = self.summary()
         if self.csv_out:
-            fieldnames = ["ts", "latency_ms", "status_code", "size_bytes", "error"]
             try:
                 with open(self.csv_out, "w", newline="") as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    writer = csv.DictWriter(f, fieldnames=self.csv_fields)
                     writer.writeheader()
                     for r in self.records:
-                        row = {
-                            "ts": r.get("ts"),
-                            "latency_ms": r.get("latency_ms"),
-                            "status_code": r.get("status_code"),
-                            "size_bytes": r.get("size_bytes", ""),
-                            "error": r.get("error", ""),
-                        }
-                        writer.writerow(row)
+                        writer.writerow({k: r.get(k, "") for k in self.csv_fields})
                 print(f"Wrote per-request CSV to {self.csv_out}")
             except Exception as exc:
                 print(f"Failed to write CSV: {exc}", file=sys.stderr)
@@ -244,6 +268,245 @@ class BenchRunner:
         return summary
 
 
+# ---- Page-load mode ----
+
+
+class AssetParser(HTMLParser):
+    """
+    Collects the sub-resources a browser would fetch for an HTML document: scripts, stylesheets, module
+    preloads, icons, images, and the modules SvelteKit imports from its inline bootstrap script.
+    """
+
+    LINK_RELS = {"stylesheet", "modulepreload", "preload", "icon", "shortcut icon", "apple-touch-icon", "manifest"}
+    INLINE_IMPORT_RE = re.compile(r"""import\(\s*["']([^"']+)["']\s*\)""")
+
+    def __init__(self):
+        super().__init__()
+        self.assets: List[str] = []
+        self._in_inline_script = False
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        if tag == "script":
+            if a.get("src"):
+                self.assets.append(a["src"])
+            else:
+                self._in_inline_script = True
+        elif tag == "link" and a.get("href"):
+            rels = (a.get("rel") or "").lower()
+            if rels in self.LINK_RELS or any(rel in self.LINK_RELS for rel in rels.split()):
+                self.assets.append(a["href"])
+        elif tag == "img" and a.get("src"):
+            self.assets.append(a["src"])
+
+    def handle_endtag(self, tag):
+        if tag == "script":
+            self._in_inline_script = False
+
+    def handle_data(self, data):
+        if self._in_inline_script:
+            self.assets.extend(self.INLINE_IMPORT_RE.findall(data))
+
+
+def find_assets(base_url: str, html: str) -> List[str]:
+    parser = AssetParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        pass
+    seen = set()
+    urls = []
+    for ref in parser.assets:
+        if ref.startswith("data:"):
+            continue
+        url = urljoin(base_url, ref).split("#", 1)[0]
+        if urlsplit(url).scheme in ("http", "https") and url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+
+def cache_lifetime(headers: httpx.Headers) -> Optional[float]:
+    """
+    Seconds a response may be served from cache without a request, per Cache-Control max-age minus Age.
+    None means it must not be stored (no-store); 0 means it must be revalidated before reuse.
+    """
+    directives = {}
+    for part in headers.get("cache-control", "").lower().split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name] = value.strip('"')
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    try:
+        max_age = float(directives.get("max-age", 0))
+        age = float(headers.get("age", 0))
+    except ValueError:
+        return 0.0
+    return max(0.0, max_age - age)
+
+
+class PageLoadRunner(BenchRunner):
+    """
+    Each worker behaves like one browser: a cold visit with an empty cache and fresh connections, followed by
+    `warm_visits` repeat visits. On warm visits, responses still fresh per Cache-Control (e.g. Vite's hashed
+    /_app/immutable/ chunks) are served from cache without a request; stale ones are revalidated with
+    If-None-Match. Sub-resources are fetched concurrently, limited to `per_origin_limit` in-flight requests
+    per origin (browsers use 6 for HTTP/1.1). One page load counts as one request towards -n; it is an error
+    if any sub-resource fails or returns 4xx/5xx. by_status, by_error and total_errors describe page loads;
+    sub-resource outcomes are reported separately under resource_status and resource_errors.
+    """
+
+    csv_fields = ["ts", "worker", "latency_ms", "status_code", "size_bytes", "target_id", "cache", "resources", "cache_hits",
+                  "not_modified", "failed_resources", "error"]
+
+    def __init__(self, *args, warm_visits: int = 1, per_origin_limit: int = 6, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.warm_visits = max(0, warm_visits)
+        self.per_origin_limit = max(1, per_origin_limit)
+        self.page_load_ms: Dict[str, List[float]] = {"cold": [], "warm": []}
+        self.resource_counts: List[int] = []
+        self.cache_hits = 0
+        self.not_modified = 0
+        self.failed_page_loads = 0
+        self.resource_status = Counter()
+        self.resource_errors = Counter()
+        # loading the CA bundle takes tens of milliseconds and blocks the event loop, so every simulated
+        # user shares one context; TLS sessions are still negotiated per client
+        self._ssl_context = httpx.create_ssl_context(trust_env=True)
+
+    def _limits(self) -> httpx.Limits:
+        # per simulated user; the per-origin cap is enforced by semaphores in _fetch
+        n = self.per_origin_limit * 4
+        return httpx.Limits(max_keepalive_connections=n, max_connections=n)
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(http2=self.http2, limits=self._limits(), verify=self._ssl_context, trust_env=True)
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str, cache: Dict[str, Tuple[Optional[str], bytes, float]],
+                     slots: Dict[str, asyncio.Semaphore]) -> Tuple[int, int, bytes, str]:
+        """Returns (status, bytes transferred, body, outcome) where outcome is 'hit', 'not_modified' or 'network'."""
+        cached = cache.get(url)
+        if cached and time.monotonic() < cached[2]:
+            return 200, 0, cached[1], "hit"
+
+        headers = dict(self.headers)
+        if cached and cached[0]:
+            headers["If-None-Match"] = cached[0]
+        origin = urlsplit(url)[:2]
+        if origin not in slots:
+            slots[origin] = asyncio.Semaphore(self.per_origin_limit)
+        async with slots[origin]:
+            resp = await client.get(url, headers=headers, timeout=self.timeout)
+
+        lifetime = cache_lifetime(resp.headers)
+        if resp.status_code == 304 and cached:
+            if lifetime is not None:
+                cache[url] = (resp.headers.get("etag", cached[0]), cached[1], time.monotonic() + lifetime)
+            return 304, len(resp.content), cached[1], "not_modified"
+        etag = resp.headers.get("etag")
+        if resp.status_code == 200 and lifetime is not None and (etag or lifetime > 0):
+            cache[url] = (etag, resp.content, time.monotonic() + lifetime)
+        return resp.status_code, len(resp.content), resp.content, "network"
+
+    async def _page_load(self, client: httpx.AsyncClient, url: str,
+                         cache: Dict[str, Tuple[Optional[str], bytes, float]]) -> dict:
+        slots: Dict[str, asyncio.Semaphore] = {}
+        status, size, body, outcome = await self._fetch(client, url, cache, slots)
+        self.status_counter[str(status)] += 1
+        outcomes = Counter([outcome])
+        assets = []
+        if status < 400:
+            assets = find_assets(url, body.decode("utf-8", errors="replace"))
+        results = await asyncio.gather(*(self._fetch(client, a, cache, slots) for a in assets), return_exceptions=True)
+        failed = 0
+        for res in results:
+            if isinstance(res, Exception):
+                self.resource_errors[type(res).__name__] += 1
+                failed += 1
+                continue
+            self.resource_status[str(res[0])] += 1
+            size += res[1]
+            outcomes[res[3]] += 1
+            if res[0] >= 400:
+                failed += 1
+        self.cache_hits += outcomes["hit"]
+        self.not_modified += outcomes["not_modified"]
+        result = {"status_code": status, "size_bytes": size, "resources": len(assets), "cache_hits": outcomes["hit"],
+                  "not_modified": outcomes["not_modified"], "failed_resources": failed}
+        if failed:
+            result["error"] = f"{failed} of {len(assets)} sub-resources failed"
+        return result
+
+    async def _worker(self, client: httpx.AsyncClient, pbar: Optional[tqdm] = None, worker_id: int = 0):
+        # each simulated user has its own connection pool; the shared `client` is not used
+        own_client: Optional[httpx.AsyncClient] = None
+        cache: Dict[str, Tuple[Optional[str], bytes, float]] = {}
+        visit = 0
+        try:
+            while await self._should_continue():
+                n = await self._increment_counter()
+                if self.total_requests is not None and n > self.total_requests:
+                    break
+
+                kind = "cold" if visit % (self.warm_visits + 1) == 0 else "warm"
+                if kind == "cold":
+                    # a new browser: empty cache and no warm connections (TCP/TLS setup is part of the load)
+                    cache.clear()
+                    if own_client:
+                        await own_client.aclose()
+                    own_client = self._new_client()
+                visit += 1
+
+                url, target_id = self._pick_target()
+                t0 = time.monotonic()
+                try:
+                    result = await self._page_load(own_client, url, cache)
+                    latency_ms = (time.monotonic() - t0) * 1000.0
+                    self.latencies_ms.append(latency_ms)
+                    self.page_load_ms[kind].append(latency_ms)
+                    self.resource_counts.append(result["resources"])
+                    self.resp_sizes.append(result["size_bytes"])
+                    if "error" in result or result["status_code"] >= 400:
+                        self.failed_page_loads += 1
+                    self.records.append({"ts": time.time(), "worker": worker_id, "latency_ms": round(latency_ms, 3),
+                                         "target_id": target_id, "cache": kind, **result})
+                except Exception as exc:
+                    latency_ms = (time.monotonic() - t0) * 1000.0
+                    self.latencies_ms.append(latency_ms)
+                    self.errors_counter[type(exc).__name__] += 1
+                    self.failed_page_loads += 1
+                    self.records.append({"ts": time.time(), "worker": worker_id, "latency_ms": round(latency_ms, 3),
+                                         "status_code": None, "target_id": target_id, "cache": kind,
+                                         "error": str(exc)})
+                if pbar:
+                    pbar.update(1)
+
+                if self.rate_per_worker and self.rate_per_worker > 0:
+                    await asyncio.sleep(max(0.0, (1.0 / self.rate_per_worker)))
+        finally:
+            if own_client:
+                await own_client.aclose()
+
+    def summary(self):
+        summary = super().summary()
+        summary["page_loads_per_second"] = summary.pop("requests_per_second")
+        summary["total_errors"] = self.failed_page_loads
+        summary["failed_page_loads"] = self.failed_page_loads
+        summary["resource_status"] = dict(self.resource_status)
+        summary["resource_errors"] = dict(self.resource_errors)
+        summary["page_load_ms"] = {kind: dict(latency_stats(v), count=len(v)) for kind, v in self.page_load_ms.items()}
+        summary["resources_per_page_mean"] = (
+            sum(self.resource_counts) / len(self.resource_counts) if self.resource_counts else 0.0
+        )
+        summary["cache_hits"] = self.cache_hits
+        summary["not_modified_responses"] = self.not_modified
+        return summary
+
+
 # ---- CLI ----
 
 
@@ -258,6 +521,13 @@ def parse_headers(header_list: Optional[List[str]]):
     return hdrs
 
 
+def load_ids(path: Optional[str]) -> Optional[List[str]]:
+    if not path:
+        return None
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
 def main():
     parser = argparse.ArgumentParser(description="Async benchmarking tool for testing Azure SWA load balancing behavior.")
     parser.add_argument("url", help="Target URL to request (e.g., https://<app>.azurestaticapps.net/)")
@@ -273,11 +543,29 @@ def main():
     parser.add_argument("--rate", type=float, default=0.0, help="Per-worker rate (requests/sec) to throttle each worker. 0 = no pacing")
     parser.add_argument("--csv", help="Write per-request CSV file path")
     parser.add_argument("--json", help="Write full JSON file path")
+    parser.add_argument("--page-load", action="store_true", help="Browser-like mode: fetch each page and all its sub-resources")
+    parser.add_argument("--warm-visits", type=int, default=1, help="Page-load mode: warm-cache repeat visits after each cold visit (default: 1)")
+    parser.add_argument("--per-origin", type=int, default=6, help="Page-load mode: max concurrent requests per origin per user (default: 6)")
+    parser.add_argument("--ids", help="File with one id per line; each request replaces {id} in the URL with a random one")
+    parser.add_argument("--monitor-interval", type=float, default=0.1, help="Client resource sampling interval in seconds (default: 0.1)")
+    parser.add_argument("--lag-threshold", type=float, default=50.0, help="Event-loop lag p99 (ms) above which the run is flagged as client-bound (default: 50)")
+    parser.add_argument("--cpu-threshold", type=float, default=90.0, help="Mean client CPU (%% of one core) above which the run is flagged as client-bound (default: 90)")
+    parser.add_argument("--strict", action="store_true",
+                        help="Exit with status 2 if the load generator was saturated or the run was too short to tell")
+    parser.add_argument("--profile", help="Profile the harness with cProfile and write stats to this path")
     args = parser.parse_args()
 
     headers = parse_headers(args.header)
-
-    runner = BenchRunner(
+    ids = load_ids(args.ids)
+    if ids is not None and "{id}" not in args.url:
+        parser.error("--ids requires an {id} placeholder in the URL")
+    if ids is not None and not ids:
+        parser.error(f"--ids file {args.ids} contains no ids")
+
+    runner_kwargs = {}
+    if args.page_load:
+        runner_kwargs = {"warm_visits": args.warm_visits, "per_origin_limit": args.per_origin}
+    runner = (PageLoadRunner if args.page_load else BenchRunner)(
         url=args.url,
         concurrency=args.concurrency,
         total_requests=args.requests,
@@ -290,10 +578,13 @@ def main():
         rate_per_worker=args.rate if args.rate and args.rate > 0 else None,
         csv_out=args.csv,
         json_out=args.json,
+        monitor=LoopMonitor(args.monitor_interval, args.lag_threshold, args.cpu_threshold),
+        ids=ids,
+        **runner_kwargs,
     )
 
     try:
-        asyncio.run(runner.run())
+        run_profiled(runner.run(), args.profile)
     except KeyboardInterrupt:
         print("Interrupted by user; finishing...")
 
@@ -301,7 +592,12 @@ def main():
     summary = runner.write_outputs()
     # print summary
     print("\nSUMMARY")
-    print(json.dumps(summary, indent=2))
+    # client health is printed in readable form below (and kept in the --json output)
+    print(json.dumps({k: v for k, v in summary.items() if k != "client"}, indent=2))
+    if "client" in summary:
+        print_client_summary(summary["client"])
+        if args.strict and not summary["valid"]:
+            sys.exit(2)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
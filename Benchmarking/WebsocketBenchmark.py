@@ -5,9 +5,12 @@ WebSocket benchmark server+client for latency testing.
 - Hosts a simple WebSocket echo API (server) that timestamps receives and echoes back.
 - Runs a client benchmark with N workers, each sending M messages, measuring round-trip latency.
 - Default: 20 workers x 50 messages.
+- Monitors client event-loop lag, CPU, RSS and open sockets; flags runs where the client was the bottleneck
+  (--strict exits non-zero for such runs).
 
 Requirements:
     pip install websockets
+    pip install psutil  # optional, more accurate resource sampling
 
 Usage examples:
 1) Run server+benchmark in one process (default):
@@ -17,11 +20,17 @@ Usage examples:
     python ws_benchmark.py --server-only --host 0.0.0.0 --port 8765
 
 3) Run client-only against an existing server:
-    python ws_benchmark.py --client-only ws://localhost:8765 --workers 20 --msgs 50 --out-csv results.csv
+    python ws_benchmark.py --client-only --client-uri ws://localhost:8765 --workers 20 --msgs 50 --out-csv results.csv
+
+Add --out-json summary.json for a machine-readable summary and --strict to exit with status 2 when
+the client was saturated or the run was too short to judge. In the default mode the echo server shares the
+client's process, so the health figures include its work; use modes 2 and 3 to isolate the client.
 """
 import argparse
 import asyncio
 import csv
+import json
+import sys
 import time
 from datetime import datetime
 from statistics import mean, median
@@ -29,6 +38,8 @@ from typing import List, Dict, Optional
 
 import websockets
 
+from ResourceMonitor import LoopMonitor, print_client_summary, run_profiled
+
 # Utility
 def utc_now_iso(with_ms=True):
     if with_ms:
@@ -37,7 +48,7 @@ def utc_now_iso(with_ms=True):
 
 
 # --- WebSocket server handler --- #
-async def ws_handler(websocket, path):
+async def ws_handler(websocket, path=None):
     """
     Simple server that echoes incoming messages and appends a server timestamp.
     Keeps running while the client is connected.
@@ -135,7 +146,9 @@ def write_csv(path: str, all_results: List[Dict]):
 
 
 # --- Orchestration --- #
-async def run_benchmark(uri: str, workers: int, msgs_per_worker: int, out_csv: Optional[str]):
+async def run_benchmark(uri: str, workers: int, msgs_per_worker: int, out_csv: Optional[str],
+                        monitor: Optional[LoopMonitor] = None, out_json: Optional[str] = None,
+                        server_in_process: bool = False) -> Dict:
     total_expected = workers * msgs_per_worker
     print(f"Running benchmark against {uri}")
     print(f"Workers: {workers}, Messages/worker: {msgs_per_worker}, Total messages: {total_expected}")
@@ -143,6 +156,8 @@ async def run_benchmark(uri: str, workers: int, msgs_per_worker: int, out_csv: O
 
     start_dt = datetime.utcnow()
     start_perf = time.perf_counter()
+    if monitor:
+        monitor.start()
 
     # Launch worker tasks concurrently
     tasks = [
@@ -151,6 +166,8 @@ async def run_benchmark(uri: str, workers: int, msgs_per_worker: int, out_csv: O
     ]
     # Wait for all to finish
     await asyncio.gather(*tasks)
+    if monitor:
+        await monitor.stop()
 
     end_perf = time.perf_counter()
     end_dt = datetime.utcnow()
@@ -174,41 +191,58 @@ async def run_benchmark(uri: str, workers: int, msgs_per_worker: int, out_csv: O
     print(f"  ~95th:  {stats['p95']:.6f}")
     throughput = stats['total'] / elapsed if elapsed > 0 else 0.0
     print(f"\nAggregate throughput (messages/sec) measured during benchmark: {throughput:.2f} msgs/sec")
+    summary = {"elapsed_s": elapsed, "throughput_msgs_per_s": throughput, "rtt_s": stats,
+               "server_in_process": server_in_process}
+    if monitor:
+        summary["client"] = monitor.summary()
+        # with a co-located echo server, lag and CPU cannot be attributed to the client alone
+        summary["client"]["server_in_process"] = server_in_process
+        summary["valid"] = summary["client"]["valid"]
+        print_client_summary(summary["client"])
 
     if out_csv:
         write_csv(out_csv, results)
-
-
-async def main_async(args):
-    # Start server if requested
+    if out_json:
+        try:
+            with open(out_json, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+            print(f"Wrote JSON summary to {out_json}")
+        except Exception as e:
+            print(f"Failed to write JSON to {out_json}: {e}")
+    return summary
+
+
+async def main_async(args) -> Optional[Dict]:
+    # Start server unless we only run clients against a remote one
     server = None
-    server = await websockets.serve(ws_handler, args.host, args.port)
-    print(f"WebSocket server listening on ws://{args.host}:{args.port} (echo service)")
+    if not args.client_only:
+        server = await websockets.serve(ws_handler, args.host, args.port)
+        print(f"WebSocket server listening on ws://{args.host}:{args.port} (echo service)")
 
     try:
-        await asyncio.Future()  # run forever
+        if args.server_only:
+            await asyncio.Future()  # run forever
+            return None
+
+        # Decide URI to connect to for clients
+        if args.client_uri:
+            uri = args.client_uri
+        else:
+            uri = f"ws://{args.host}:{args.port}"
+
+        # Small delay to ensure server is ready (if started here)
+        if server:
+            await asyncio.sleep(0.1)
+
+        # Run benchmark (clients)
+        monitor = LoopMonitor(args.monitor_interval, args.lag_threshold, args.cpu_threshold)
+        return await run_benchmark(uri, args.workers, args.msgs, args.out_csv, monitor, args.out_json,
+                                   server_in_process=server is not None)
     finally:
+        # Shutdown server if we started it
         if server:
             server.close()
             await server.wait_closed()
-    return
-
-    # Decide URI to connect to for clients
-    if args.client_uri:
-        uri = args.client_uri
-    else:
-        uri = f"ws://{args.host}:{args.port}"
-
-    # Small delay to ensure server is ready (if started here)
-    await asyncio.sleep(0.1)
-
-    # Run benchmark (clients)
-    await run_benchmark(uri, args.workers, args.msgs, args.out_csv)
-
-    # Shutdown server if we started it
-    if server:
-        server.close()
-        await server.wait_closed()
 
 
 def parse_args():
@@ -218,21 +252,39 @@ def parse_args():
     p.add_argument("--workers", type=int, default=20, help="Number of concurrent worker clients (default: 20)")
     p.add_argument("--msgs", type=int, default=50, help="Messages per worker (default: 50)")
     p.add_argument("--out-csv", default=None, help="Optional CSV file to write per-message results")
+    p.add_argument("--out-json", default=None, help="Optional JSON file to write the summary (incl. client health)")
     p.add_argument("--server-only", action="store_true", help="Start server and do not run clients (useful for remote clients)")
     p.add_argument("--client-only", action="store_true", dest="client_only",
-                   help="Do not start a server locally; only run client benchmark against --client-uri")
+                   help="Do not start a server locally; only run client benchmark against --client-uri "
+                        "(default: ws://<host>:<port>)")
     p.add_argument("--client-uri", default=None, help="WebSocket URI for client-only mode, e.g. ws://host:8765")
-    return p.parse_args()
+    p.add_argument("--monitor-interval", type=float, default=0.1,
+                   help="Client resource sampling interval in seconds (default: 0.1)")
+    p.add_argument("--lag-threshold", type=float, default=50.0,
+                   help="Event-loop lag p99 (ms) above which the run is flagged as client-bound (default: 50)")
+    p.add_argument("--cpu-threshold", type=float, default=90.0,
+                   help="Mean client CPU (%% of one core) above which the run is flagged as client-bound (default: 90)")
+    p.add_argument("--profile", default=None, help="Profile the harness with cProfile and write stats to this path")
+    p.add_argument("--strict", action="store_true",
+                   help="Exit with status 2 if the load generator was saturated or the run was too short to tell")
+    args = p.parse_args()
+    if args.server_only and args.client_only:
+        p.error("--server-only and --client-only are mutually exclusive")
+    return args
 
 
 def main():
     args = parse_args()
 
+    summary = None
     try:
-        asyncio.run(main_async(args))
+        summary = run_profiled(main_async(args), args.profile)
     except KeyboardInterrupt:
         print("\nInterrupted by user. Exiting.")
 
+    if args.strict and summary and not summary.get("valid", True):
+        sys.exit(2)
+
 
 if __name__ == "__main__":
     main()